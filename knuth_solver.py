@@ -19,84 +19,343 @@ accomplish it, but I just used methods (and some code) I found.
 :created: 2024-11-04
 """
 import functools as ft
-import itertools as it
-from typing import Iterator
+from typing import Iterable, Iterator
 
+import numba as nb
+import numpy as np
 
-def _zero_based_int_to_chr(i: int) -> str:
-    """Convert a 0-based int to a char where 0 -> '1'."""
-    return chr(i + 49)
 
+# ===================================================================================
+#   Knuth's Dancing Links (DLX) implementation of algorithm X
+#   https://arxiv.org/abs/cs/0011047
+#
+#   An earlier version of this file used Ali Assaf's dict-of-sets formulation
+#   (https://aliassaf.github.io/software/algorithm-x/). The dicts worked, but every
+#   cover rebuilt sets and hashed every conflicting row. Knuth's toroidal linked
+#   list does the same bookkeeping with pointer swaps and no allocation at all.
+#   The four links (and a couple of bookkeeping values) per node are packed in
+#   parallel numpy int32 arrays instead of node objects, and the search itself is
+#   compiled with numba, so the pointer chasing runs as C loops over contiguous
+#   memory instead of through the interpreter.
+# ===================================================================================
+
+DlxArrays = tuple[
+    np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray
+]
 
-def _chr_to_zero_based_int(ch: str) -> int:
-    """Convert a char to a 0-based int where '1' -> 0."""
-    return ord(ch) - 49
+
+def build_dlx_arrays(row2cols: dict[int, list[int]], n_cols: int) -> DlxArrays:
+    """Build the DLX toroidal list as parallel arrays.
+
+    :param row2cols: A dict mapping row numbers to lists of column numbers.
+        This is Sudoku.row2satisfied_conditions.
+    :param n_cols: The total number of constraint columns (4 * order**2).
+    :return: (L, R, U, D, C, S, N) where
+
+        * L, R, U, D are the left, right, up, and down links of each node
+        * C maps each node to its column header
+        * S counts the nodes remaining in each column (indexed by header)
+        * N maps each node back to its row number in row2cols
+
+    Node 0 is the root, nodes 1 through n_cols are the column headers, and the
+    rest are one node per 1 in the sparse matrix. The whole structure is linked
+    with array arithmetic: horizontal links are a roll of each row's node ids,
+    and vertical links come from a stable sort of the nodes by column id, which
+    groups each column's nodes in row order so every node's up-neighbor is
+    either the previous node in the sorted run or the column header.
+    """
+    rows = np.fromiter(row2cols, count=len(row2cols), dtype=np.int32)
+    cols = np.array(list(row2cols.values()), dtype=np.int32)
+    by_row = np.argsort(rows)
+    rows, cols = rows[by_row], cols[by_row]
+    n_nodes = 1 + n_cols + cols.size
+    L, R, U, D, C = (np.empty(n_nodes, dtype=np.int32) for _ in range(5))
+    S = np.zeros(n_nodes, dtype=np.int32)
+    N = np.zeros(n_nodes, dtype=np.int32)
+
+    # link the root and column headers into a circular header list
+    headers = np.arange(n_cols + 1, dtype=np.int32)
+    L[headers] = headers - 1
+    L[0] = n_cols
+    R[headers] = headers + 1
+    R[n_cols] = 0
+    U[headers] = D[headers] = C[headers] = headers
+
+    nodes = np.arange(cols.size, dtype=np.int32).reshape(cols.shape) + n_cols + 1
+    L[nodes] = np.roll(nodes, 1, axis=1)
+    R[nodes] = np.roll(nodes, -1, axis=1)
+    C[nodes] = cols + 1
+    N[nodes] = rows[:, None]
+    S[1 : n_cols + 1] = np.bincount(cols.ravel(), minlength=n_cols)
+
+    by_col = np.argsort(cols.ravel(), kind="stable")
+    col_nodes = nodes.ravel()[by_col]
+    col_headers = cols.ravel()[by_col] + 1
+    starts_col = np.r_[True, col_headers[1:] != col_headers[:-1]]
+    above = np.where(starts_col, col_headers, np.r_[0, col_nodes[:-1]])
+    U[col_nodes] = above
+    D[above] = col_nodes
+    ends_col = np.r_[starts_col[1:], True]
+    U[col_headers[ends_col]] = col_nodes[ends_col]
+    D[col_nodes[ends_col]] = col_headers[ends_col]
+    return L, R, U, D, C, S, N
+
+
+@nb.njit(cache=True)
+def _algo_x_cover(L, R, U, D, C, S, col: int):
+    """Unlink column col and every row that satisfies it from the matrix."""
+    L[R[col]] = L[col]
+    R[L[col]] = R[col]
+    node = D[col]
+    while node != col:
+        sibling = R[node]
+        while sibling != node:
+            U[D[sibling]] = U[sibling]
+            D[U[sibling]] = D[sibling]
+            S[C[sibling]] -= 1
+            sibling = R[sibling]
+        node = D[node]
+
+
+@nb.njit(cache=True)
+def _algo_x_uncover(L, R, U, D, C, S, col: int):
+    """Relink column col, exactly reversing _algo_x_cover."""
+    node = U[col]
+    while node != col:
+        sibling = L[node]
+        while sibling != node:
+            S[C[sibling]] += 1
+            U[D[sibling]] = sibling
+            D[U[sibling]] = sibling
+            sibling = L[sibling]
+        node = U[node]
+    L[R[col]] = col
+    R[L[col]] = col
+
+
+@nb.njit(cache=True)
+def _algo_x_min_col(R, S) -> int:
+    """Return the active column header with the fewest remaining rows."""
+    col = R[0]
+    header = R[col]
+    while header != 0:
+        if S[header] < S[col]:
+            col = header
+        header = R[header]
+    return col
+
+
+@nb.njit(cache=True)
+def algo_x_solve(L, R, U, D, C, S, N):
+    """Yield all solutions to the exact cover problem represented by the DLX lists.
+
+    :param L R U D C S N: The arrays from build_dlx_arrays.
+    :yield: An array of row numbers that form a solution.
+
+    * Find the column with the minimum remaining rows.
+    * Select a row from that column.
+    * Cover every column that row satisfies (unlinking conflicting rows).
+    * If all remaining constraints are still met, continue; else backtrack.
+
+    This is Knuth's recursive search(k) unrolled onto an explicit stack (choice[k]
+    is the node selected at depth k). A compiled function cannot suspend mid
+    recursion to hand a solution back to the interpreter, but numba compiles plain
+    generators, so the iterative form yields each solution as it is found.
+    """
+    choice = np.empty(len(S), dtype=np.int32)
+    if R[0] == 0:
+        yield choice[:0]
+        return
+    k = 0
+    col = _algo_x_min_col(R, S)
+    if S[col] == 0:
+        return
+    _algo_x_cover(L, R, U, D, C, S, col)
+    choice[k] = D[col]
+    while True:
+        node = choice[k]
+        col = C[node]
+        if node == col:
+            # column exhausted, so backtrack
+            _algo_x_uncover(L, R, U, D, C, S, col)
+            if k == 0:
+                return
+            k -= 1
+            node = choice[k]
+            sibling = L[node]
+            while sibling != node:
+                _algo_x_uncover(L, R, U, D, C, S, C[sibling])
+                sibling = L[sibling]
+            choice[k] = D[node]
+            continue
+        # try node's row: cover every other column that row satisfies
+        sibling = R[node]
+        while sibling != node:
+            _algo_x_cover(L, R, U, D, C, S, C[sibling])
+            sibling = R[sibling]
+        if R[0] == 0:
+            solution = np.empty(k + 1, dtype=np.int32)
+            for depth in range(k + 1):
+                solution[depth] = N[choice[depth]]
+            yield solution
+            sibling = L[node]
+            while sibling != node:
+                _algo_x_uncover(L, R, U, D, C, S, C[sibling])
+                sibling = L[sibling]
+            choice[k] = D[node]
+            continue
+        col = _algo_x_min_col(R, S)
+        if S[col] == 0:
+            # some constraint has no remaining rows, so this branch is
+            # infeasible; undo node's row and advance without descending
+            sibling = L[node]
+            while sibling != node:
+                _algo_x_uncover(L, R, U, D, C, S, C[sibling])
+                sibling = L[sibling]
+            choice[k] = D[node]
+            continue
+        k += 1
+        _algo_x_cover(L, R, U, D, C, S, col)
+        choice[k] = D[col]
 
 
 # ===================================================================================
-#   Ali Assaf's sparse-matrix algorithm X solver
+#   Ali Assaf's algorithm X formulation with integer bitmasks
 #   https://aliassaf.github.io/software/algorithm-x/
 #
-#   Not quite verbatim from his site, but *almost*.
+#   The same search as the DLX solver above, but in pure Python with no
+#   dependencies. Assaf keeps a dict mapping each column to a set of row numbers;
+#   here each column's row set is a single Python int with one bit per row (at most
+#   9**3 = 729 bits for an order-9 puzzle). Removing a row is `mask &= ~bit`,
+#   snapshotting a column for backtracking is an integer copy, and the min-size
+#   column heuristic is int.bit_count.
 # ===================================================================================
 
-Col2Rows = dict[int, set[int]]
 Row2Cols = dict[int, list[int]]
 
 
-def algo_x_solve(
-    col2rows: Col2Rows,
+def algo_x_solve_masks(
+    col2mask: list[int],
     row2cols: Row2Cols,
+    active_cols: int,
     solution: list[int] | None = None,
+    dead_ends: set[int] | None = None,
 ) -> Iterator[list[int]]:
-    """Yield all solutions to the exact cover problem represented by col_to_rows.
+    """Yield all solutions to the exact cover problem represented by col2mask.
 
-    :param col_to_rows: A dict mapping column numbers to sets of row numbers.
-        This is Sudoku.condition2included_rows.
-    :param row_to_cols: A dict mapping row numbers to lists of column numbers.
+    :param col2mask: A bitmask of included row numbers for each column number.
+        This is Sudoku.condition2row_mask.
+    :param row2cols: A dict mapping row numbers to lists of column numbers.
         This is Sudoku.row2satisfied_conditions.
+    :param active_cols: A bitmask of the column numbers not yet satisfied.
     :param solution: A list of row numbers that have been selected so far.
+    :param dead_ends: active_cols signatures of subproblems known to have no
+        solutions. The set of still-active columns completely identifies a
+        subproblem (a row is available iff all of its columns are active), so a
+        signature seen to fail once can never succeed. This is a cut-down version
+        of the caching in Knuth's DXZ; memoizing solvable subproblems as well
+        would mean storing their solution sets, which could not stay lazy.
     :yield: A list of row numbers that form a solution.
-
-    * Find the column with the minimum conflicts.
-    * Select a row from that column.
-    * Remove that row, remove any conflicting rows, and remove any constraints that
-      row satisfied.
-    * If all remaining constraints are still met, continue; else backtrack.
     """
     solution = solution or []
-    if not col2rows:
+    dead_ends = set() if dead_ends is None else dead_ends
+    if not active_cols:
         yield list(solution)
         return
-    col = min(col2rows, key=lambda c: len(col2rows[c]))
-    for row in list(col2rows[col]):
+    if active_cols in dead_ends:
+        return
+    col = -1
+    fewest = -1
+    remaining = active_cols
+    while remaining:
+        low_bit = remaining & -remaining
+        remaining ^= low_bit
+        size = col2mask[low_bit.bit_length() - 1].bit_count()
+        if fewest < 0 or size < fewest:
+            fewest = size
+            col = low_bit.bit_length() - 1
+    found_any = False
+    rows = col2mask[col]
+    while rows:
+        low_bit = rows & -rows
+        rows ^= low_bit
+        row = low_bit.bit_length() - 1
         solution.append(row)
-        cached_cols = _algo_x_select(col2rows, row2cols, row)
-        yield from algo_x_solve(col2rows, row2cols, solution)
-        _algo_x_deselect(col2rows, row2cols, row, cached_cols)
+        cached_masks = _algo_x_mask_select(col2mask, row2cols, row)
+        sub_active = active_cols
+        for satisfied_col in row2cols[row]:
+            sub_active &= ~(1 << satisfied_col)
+        for sub_solution in algo_x_solve_masks(
+            col2mask, row2cols, sub_active, solution, dead_ends
+        ):
+            found_any = True
+            yield sub_solution
+        _algo_x_mask_deselect(col2mask, row2cols, row, cached_masks)
         _ = solution.pop()
+    if not found_any:
+        dead_ends.add(active_cols)
 
 
-def _algo_x_select(col2rows: Col2Rows, row2cols: Row2Cols, row: int) -> list[set[int]]:
+def _algo_x_mask_select(
+    col2mask: list[int], row2cols: Row2Cols, row: int
+) -> list[int]:
     """Remove row and requirements it satisfies from the sparse matrix."""
-    cols: list[set[int]] = []
+    masks: list[int] = []
     for exclusive_col in row2cols[row]:
-        for row_with_col in col2rows[exclusive_col]:
+        rows_with_col = col2mask[exclusive_col]
+        remaining = rows_with_col
+        while remaining:
+            low_bit = remaining & -remaining
+            remaining ^= low_bit
+            row_with_col = low_bit.bit_length() - 1
             for other_col in (x for x in row2cols[row_with_col] if x != exclusive_col):
-                col2rows[other_col].remove(row_with_col)
-        cols.append(col2rows.pop(exclusive_col))
-    return cols
+                col2mask[other_col] &= ~low_bit
+        masks.append(rows_with_col)
+        col2mask[exclusive_col] = 0
+    return masks
 
 
-def _algo_x_deselect(
-    col2rows: Col2Rows, row2cols: Row2Cols, row: int, cols: list[set[int]]
+def _algo_x_mask_deselect(
+    col2mask: list[int], row2cols: Row2Cols, row: int, masks: list[int]
 ):
-    """Restore the rows to the columns that were removed in _algo_x_select."""
+    """Restore the rows to the columns that were removed in _algo_x_mask_select."""
     for exclusive_col in reversed(row2cols[row]):
-        col2rows[exclusive_col] = cols.pop()
-        for row_with_col in col2rows[exclusive_col]:
+        col2mask[exclusive_col] = masks.pop()
+        remaining = col2mask[exclusive_col]
+        while remaining:
+            low_bit = remaining & -remaining
+            remaining ^= low_bit
+            row_with_col = low_bit.bit_length() - 1
             for other_col in (x for x in row2cols[row_with_col] if x != exclusive_col):
-                col2rows[other_col].add(row_with_col)
+                col2mask[other_col] |= low_bit
+
+
+@ft.lru_cache
+def _constraint_templates(
+    order: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return the full sparse-matrix layout for a puzzle order.
+
+    :return: (v, r, c, row_idxs, cols) where v, r, c are the (order, order,
+        order) grids of every possible cell state, row_idxs maps each state to
+        its matrix row number, and cols holds the four constraint columns each
+        state satisfies.
+
+    This depends only on order, so one copy is shared by every Sudoku instance;
+    each instance just filters it against its own given values.
+    """
+    box_d = int(order**0.5)
+    v, r, c = np.mgrid[:order, :order, :order]
+    box_idx = (c // box_d) + ((r // box_d) * box_d)
+    row_idxs = c + order * r + order * order * v
+    col_row = 3 * order * v + r
+    col_col = 3 * order * v + order + c
+    col_box = 3 * order * v + 2 * order + box_idx
+    col_one = 3 * order * order + (c + order * r)
+    cols = np.stack([col_row, col_col, col_box, col_one], axis=-1)
+    for arr in (v, r, c, row_idxs, cols):
+        arr.setflags(write=False)
+    return v, r, c, row_idxs, cols
 
 
 class Sudoku:
@@ -110,13 +369,15 @@ class Sudoku:
 
     @ft.cached_property
     def _given_vals(self) -> list[tuple[int, int, int]]:
-        """ATTENTION: THIS is where the chrs are converted to 0-based ints."""
-        given_vals: list[tuple[int, int, int]] = []
-        for r, c in it.product(range(self.order), repeat=2):
-            puzzle_chr_as_int = _chr_to_zero_based_int(self.puzzle[r * self.order + c])
-            if puzzle_chr_as_int >= 0:
-                given_vals.append((puzzle_chr_as_int, r, c))
-        return given_vals
+        """ATTENTION: THIS is where the chrs are converted to 0-based ints.
+
+        One vectorized pass over the puzzle bytes: '1' is byte 49, so given
+        cells are exactly the bytes that land at 0 or above after subtracting.
+        """
+        vals = np.frombuffer(self.puzzle.encode(), dtype=np.uint8).astype(np.int16)
+        vals = (vals - 49).reshape(self.order, self.order)
+        rs, cs = np.nonzero(vals >= 0)
+        return list(zip(vals[rs, cs].tolist(), rs.tolist(), cs.tolist()))
 
     def row_from_vrc(self, vrc: tuple[int, int, int]) -> int:
         """Get row index from value, row, and column."""
@@ -130,33 +391,26 @@ class Sudoku:
         v = row // (self.order * self.order)
         return v, r, c
 
-    def _conflicts_with_given(
-        self, val: int, row: int, col: int, given_vals: list[tuple[int, int, int]]
-    ) -> bool:
-        """Return True if val, row, int conflicts with any of the given values.
-
-        Return True if:
-        * row and col match, but val is not the given value
-        * val matches a given value in the same row or col
-        * val matches a given value in the same box
+    @ft.cached_property
+    def _given_lookups(
+        self,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Index _given_vals for vectorized conflict checks.
+
+        :return: (fixed_at, row_has, col_has, box_has) where fixed_at[r, c] is the
+            value given at (r, c) (or -1) and the other three are boolean grids
+            recording which values are given in each row, col, and box.
         """
-        if not given_vals:
-            return False
-        v, r, c = given_vals[0]
-        if v != val and row == r and col == c:
-            return True
-        if v == val and (row == r) != (col == c):
-            return True
-        box_beg_row = (r // self.box_d) * self.box_d
-        box_beg_col = (c // self.box_d) * self.box_d
-        if (
-            v == val
-            and box_beg_row < row < box_beg_row + self.box_d
-            and box_beg_col < col < box_beg_col + self.box_d
-            and not (row == r and col == c)
-        ):
-            return True
-        return self._conflicts_with_given(val, row, col, given_vals[1:])
+        fixed_at = np.full((self.order, self.order), -1)
+        row_has = np.zeros((self.order, self.order), dtype=bool)
+        col_has = np.zeros((self.order, self.order), dtype=bool)
+        box_has = np.zeros((self.box_d, self.box_d, self.order), dtype=bool)
+        for v, r, c in self._given_vals:
+            fixed_at[r, c] = v
+            row_has[r, v] = True
+            col_has[c, v] = True
+            box_has[r // self.box_d, c // self.box_d, v] = True
+        return fixed_at, row_has, col_has, box_has
 
     @ft.cached_property
     def row2satisfied_conditions(self):
@@ -173,43 +427,57 @@ class Sudoku:
         RRRRRRRRRCCCCCCCCCVVVVVVVVVV for most of the columns followed 81 O positions
         in the last column (for an order=9 puzzle). Staying with that because it
         works.
+
+        The shared _constraint_templates arrays hold every (value, row, col)
+        triple and its column indices; filtering against the _given_lookups
+        grids leaves one dict construction as the only Python-level work.
         """
-        row2satisfied_conditions: dict[int, list[int]] = {}
-        for v, r, c in it.product(range(self.order), repeat=3):
-            if self._conflicts_with_given(v, r, c, self._given_vals):
-                continue
-            row_idx = self.row_from_vrc((v, r, c))
-            box_idx = (c // self.box_d) + ((r // self.box_d) * self.box_d)
-            col_row = 3 * self.order * v + r
-            col_col = 3 * self.order * v + self.order + c
-            col_box = 3 * self.order * v + 2 * self.order + box_idx
-            col_one = 3 * self.order * self.order + (c + self.order * r)
-            row2satisfied_conditions[row_idx] = [col_row, col_col, col_box, col_one]
-        return row2satisfied_conditions
+        box_d = self.box_d
+        fixed_at, row_has, col_has, box_has = self._given_lookups
+        v, r, c, row_idxs, cols = _constraint_templates(self.order)
+        fixed = fixed_at[r, c]
+        conflicts = np.where(
+            fixed >= 0,
+            fixed != v,
+            row_has[r, v] | col_has[c, v] | box_has[r // box_d, c // box_d, v],
+        )
+        keep = ~conflicts
+        return dict(zip(row_idxs[keep].tolist(), cols[keep].tolist()))
 
     @ft.cached_property
-    def condition2included_rows(self) -> dict[int, set[int]]:
-        """Transform the row2satisfied_conditions to a column2included_rows dict.
+    def dlx_arrays(self) -> DlxArrays:
+        """Pack row2satisfied_conditions into the DLX linked-list arrays."""
+        return build_dlx_arrays(self.row2satisfied_conditions, self.order**2 * 4)
 
-        This is just for faster lookups.
-        """
-        col2included_rows: dict[int, set[int]]
-        col2included_rows = {x: set() for x in range(self.order**2 * 4)}
-        for k, v in self.row2satisfied_conditions.items():
-            for x in v:
-                col2included_rows[x].add(k)
-        return col2included_rows
+    @ft.cached_property
+    def condition2row_mask(self) -> list[int]:
+        """Pack row2satisfied_conditions into a bitmask of rows for each column."""
+        col2mask = [0] * (self.order**2 * 4)
+        for row, cols in self.row2satisfied_conditions.items():
+            for col in cols:
+                col2mask[col] |= 1 << row
+        return col2mask
+
+    def _format_solution(self, solution: Iterable[int]) -> str:
+        """Convert a list of selected matrix rows to a puzzle string."""
+        rows = np.asarray(solution)
+        n_cells = self.order * self.order
+        as_bytes = np.zeros(n_cells, dtype=np.uint8)
+        as_bytes[rows % n_cells] = rows // n_cells + 49
+        return bytes(as_bytes).decode()
 
     def solve(self):
-        """Solve with Ali Assaf's algorithm X solver."""
-        solutions = algo_x_solve(
-            self.condition2included_rows, self.row2satisfied_conditions
+        """Solve with Knuth's dancing-links algorithm X solver."""
+        solutions = algo_x_solve(*self.dlx_arrays)
+        yield from map(self._format_solution, solutions)
+
+    def solve_with_masks(self):
+        """Solve with the pure-python bitmask algorithm X solver."""
+        active_cols = (1 << (self.order**2 * 4)) - 1
+        solutions = algo_x_solve_masks(
+            self.condition2row_mask, self.row2satisfied_conditions, active_cols
         )
-        for solution in solutions:
-            as_ints = [[0] * self.order for _ in range(self.order)]
-            for v, r, c in map(self.vrc_from_row, solution):
-                as_ints[r][c] = v
-            yield "".join(map(_zero_based_int_to_chr, it.chain(*as_ints)))
+        yield from map(self._format_solution, solutions)
 
 
 puzzles = [
@@ -228,7 +496,8 @@ puzzles = [
 ]
 
 
-for puzzle in puzzles:
-    solution = next(Sudoku(puzzle).solve())
-    print(puzzle)
-    print(solution)
+if __name__ == "__main__":
+    for puzzle in puzzles:
+        solution = next(Sudoku(puzzle).solve())
+        print(puzzle)
+        print(solution)
@@ -7,14 +7,13 @@
 
 import functools as ft
 import itertools as it
+import numpy as np
 from typing import (
-    Iterable,
     Iterator,
     TypeVar,
     Hashable,
     Generic,
 )
-from collections import Counter
 
 
 def _iter_candidates(order: int) -> Iterator[str]:
@@ -25,31 +24,11 @@ def _iter_candidates(order: int) -> Iterator[str]:
     return map(chr, range(49, 49 + order))
 
 
-_T = TypeVar("_T")
 _CellT = TypeVar("_CellT")
 
 from typing import Sequence
 
 
-def _try_items(seq: Sequence[_T], idxs: Iterable[int]) -> list[_T]:
-    """Get a list of multiple items from a sequence."""
-
-    def _iter_items() -> Iterator[_T]:
-        for idx in idxs:
-            try:
-                yield seq[idx]
-            except IndexError:
-                return
-
-    return list(_iter_items())
-
-
-def _try_items_multi(seq: Sequence[_T], *idxs: Iterable[int]) -> Iterator[list[_T]]:
-    """Get a list of multiple items from a sequence."""
-    for idx in idxs:
-        yield _try_items(seq, idx)
-
-
 # ===================================================================================
 #   Get row, col, and box indices for a Sudoku puzzle
 #
@@ -68,29 +47,34 @@ def _try_items_multi(seq: Sequence[_T], *idxs: Iterable[int]) -> Iterator[list[_
 #   72 73 74  75 76 77  78 79 80
 # ===================================================================================
 
-Idxs = tuple[int, ...]
+Idxs = np.ndarray
 
 
 @ft.lru_cache
-def irows(order: int) -> list[Idxs]:
-    """Return a nested list of row indices from top row."""
-    return [tuple(range(i * order, i * order + order)) for i in range(order)]
+def irows(order: int) -> Idxs:
+    """Return an (order, order) array of row indices from top row."""
+    rows = np.arange(order * order).reshape(order, order)
+    rows.setflags(write=False)
+    return rows
 
 
 @ft.lru_cache
-def icols(order: int) -> list[Idxs]:
-    """Return a nested list of column indices from left column."""
-    return list(zip(*irows(order)))
+def icols(order: int) -> Idxs:
+    """Return an (order, order) array of column indices from left column."""
+    return irows(order).T
 
 
 @ft.lru_cache
-def iboxs(order: int) -> list[Idxs]:
-    """Return a nested list of box indices from top left box."""
+def iboxs(order: int) -> Idxs:
+    """Return an (order, order) array of box indices from top left box."""
     box_d = int(order ** (1 / 2))
-    boxes: list[Idxs] = []
-    for bl_rows in it.batched(irows(order), box_d):
-        bl_cols = it.batched(zip(*bl_rows), box_d)
-        boxes.extend(tuple(it.chain(*zip(*x))) for x in bl_cols)
+    boxes = (
+        np.arange(order * order)
+        .reshape(box_d, box_d, box_d, box_d)
+        .transpose(0, 2, 1, 3)
+        .reshape(order, order)
+    )
+    boxes.setflags(write=False)
     return boxes
 
 
@@ -99,6 +83,7 @@ def igroups(order: int) -> Iterator[Idxs]:
     return it.chain(irows(order), icols(order), iboxs(order))
 
 
+@ft.lru_cache(maxsize=None)
 def iconstellation(order: int, idx: int) -> tuple[Idxs, Idxs, Idxs]:
     """Return the row, col, and box indices of a cell.
 
@@ -109,21 +94,26 @@ def iconstellation(order: int, idx: int) -> tuple[Idxs, Idxs, Idxs]:
     constellation (only indexes cells that exist so far is the progressive solution)
     is returned.
     """
-
-    def _is_in_range(x: int) -> bool:
-        return x < idx
-
     box_d = int(order ** (1 / 2))
     which_row = idx // order
     which_col = idx % order
     which_box = which_row // box_d * box_d + which_col // box_d
+    row_idxs = irows(order)[which_row]
+    col_idxs = icols(order)[which_col]
+    box_idxs = iboxs(order)[which_box]
     return (
-        tuple(it.takewhile(_is_in_range, irows(order)[which_row])),
-        tuple(it.takewhile(_is_in_range, icols(order)[which_col])),
-        tuple(it.takewhile(_is_in_range, iboxs(order)[which_box])),
+        row_idxs[row_idxs < idx],
+        col_idxs[col_idxs < idx],
+        box_idxs[box_idxs < idx],
     )
 
 
+@ft.lru_cache(maxsize=None)
+def iconstellation_union(order: int, idx: int) -> Idxs:
+    """Return the unique partial row, col, and box indices of a cell."""
+    return np.unique(np.concatenate(iconstellation(order, idx)))
+
+
 # ===================================================================================
 
 
@@ -135,6 +125,7 @@ class Sudoku(Generic[_CellT]):
 
     def __init__(self, puzzle: Sequence[_CellT], len: int):
         self.puzzle = puzzle
+        self.puzzle_arr = np.array(list(puzzle), dtype=object)
         self.len = len
         self.sl = int(len ** (1 / 2))  # length of one side of puzzle
         self._bl = int(len ** (1 / 4))  # length of one side of a box
@@ -145,9 +136,9 @@ class Sudoku(Generic[_CellT]):
         self._col_idxs = icols(self.sl)
         self._box_idxs = iboxs(self.sl)
 
-    def _try_puzzle_items(self, idxs: Iterable[int]) -> list[_CellT]:
+    def _try_puzzle_items(self, idxs: Idxs) -> list[_CellT]:
         """Get a list of multiple items from self._puzzle."""
-        return _try_items(self.puzzle, idxs)
+        return list(self.puzzle_arr[idxs[idxs < len(self.puzzle)]])
 
     def _get_row(self, idx: int) -> list[_CellT]:
         """Get one row of items from self._puzzle."""
@@ -189,23 +180,39 @@ class Sudoku(Generic[_CellT]):
         ]
 
 
-def solve_group_using_logic(group: list[set[str]]) -> None:
-    """Solve a group (row, col, or box) using Sudoku logic."""
+def _mask_to_set(mask: int, order: int) -> set[str]:
+    """Convert a candidate bitmask (bit v means chr(49 + v)) to a set of chars."""
+    return {c for v, c in enumerate(_iter_candidates(order)) if mask >> v & 1}
 
-    # eliminate values that conflict with fixed (no alternatives) values
-    fixed: set[str] = set()
-    fixed.update(*(x for x in group if len(x) == 1))
-    for set_ in (x for x in group if len(x) > 1):
-        set_ -= fixed
 
-    # eliminate values trapped in "bound siblings"
-    siblings = Counter(map(frozenset, group))
-    if len(siblings) < 2:
-        return
-    for bound in (set(k) for k, v in siblings.items() if len(k) == v):
-        for set_ in (x for x in group if len(x) > 1):
-            if set_ != bound:
-                set_ -= bound
+def solve_group_using_logic(cells: np.ndarray, pops: np.ndarray, group: Idxs) -> None:
+    """Solve a group (row, col, or box) using Sudoku logic.
+
+    :param cells: a uint16 candidate bitmask for each cell in the puzzle.
+    :param pops: the popcount of each entry in cells, kept in sync here.
+    :param group: the indices of one row, col, or box.
+    """
+    masks = cells[group]
+    counts = pops[group]
+
+    # eliminate values that conflict with fixed (no alternatives) values
+    fixed = np.bitwise_or.reduce(masks[counts == 1])
+    masks[counts > 1] &= ~fixed
+    counts = np.bitwise_count(masks)
+
+    # eliminate values trapped in "bound siblings": a mask shared by exactly
+    # popcount-many cells pins those values to those cells. Bound masks are
+    # pairwise disjoint in any consistent group, so the union of all of them
+    # can be cleared from every other multi-candidate cell in one AND.
+    siblings, sibling_counts = np.unique(masks, return_counts=True)
+    if len(siblings) >= 2:
+        bound = siblings[np.bitwise_count(siblings) == sibling_counts]
+        if len(bound):
+            trapped = np.bitwise_or.reduce(bound)
+            masks[(counts > 1) & ~np.isin(masks, bound)] &= ~trapped
+            counts = np.bitwise_count(masks)
+    cells[group] = masks
+    pops[group] = counts
 
 
 def solve_as_far_as_possible_using_logic(puzzle: str) -> list[set[str]]:
@@ -216,20 +223,28 @@ def solve_as_far_as_possible_using_logic(puzzle: str) -> list[set[str]]:
     :return: a set of possible values for each cell in the puzzle. If a puzzle has
         only one possible solution, all of these sets will be singletons, and the
         puzzle will be solved.
+
+    Candidates are tracked as one uint16 bitmask per cell (bit v set means
+    chr(49 + v) is still possible), so group elimination is a few vectorized ANDs
+    over 2-byte cells instead of Python set arithmetic. The masks are converted
+    back to sets of chars on the way out.
     """
     order = int(len(puzzle) ** (1 / 2))
-    unknown = set(_iter_candidates(order))
-    puzzle_as_sets = [unknown.copy() if c == "." else {c} for c in puzzle]
+    cells = np.full(len(puzzle), (1 << order) - 1, dtype=np.uint16)
+    for i, c in enumerate(puzzle):
+        if c != ".":
+            cells[i] = 1 << (ord(c) - 49)
 
-    prev_score = sum(map(len, puzzle_as_sets))
+    pops = np.bitwise_count(cells)
+    prev_score = int(pops.sum())
     while True:
-        for group in _try_items_multi(puzzle_as_sets, *igroups(order)):
-            solve_group_using_logic(group)
-        score = sum(map(len, puzzle_as_sets))
+        for group in igroups(order):
+            solve_group_using_logic(cells, pops, group)
+        score = int(pops.sum())
         if score in {len(puzzle), prev_score}:
             break
         prev_score = score
-    return puzzle_as_sets
+    return [_mask_to_set(int(mask), order) for mask in cells]
 
 
 def complete_solution_using_backtracking(
@@ -243,30 +258,48 @@ def complete_solution_using_backtracking(
     """
     order = int(len(partial_solution) ** 0.5)
     idxs_of_known_values = {i for i, x in enumerate(partial_solution) if len(x) == 1}
+    unknown_neighbors = [
+        np.array(
+            [i for i in iconstellation_union(order, idx) if i not in idxs_of_known_values],
+            dtype=np.intp,
+        )
+        for idx in range(len(partial_solution))
+    ]
 
-    def _add_cell(
-        solution: str = "", cells: list[set[str]] = partial_solution
-    ) -> Iterator[str]:
+    cell_candidates = [sorted(map(ord, cell)) for cell in partial_solution]
+
+    def _add_cell() -> Iterator[str]:
         """If mult. candidate vals exist, try out each one at the end of the solution.
 
         At this point, the subsets of possible values do not conflict with the given
         puzzle values, so these can be excluded from validity checks.
-        """
-        if not cells:
-            yield solution
-            return
-
-        if len(cells[0]) == 1:
-            (next_cell,) = cells[0]  # unpack the singleton set
-            yield from _add_cell(solution + next_cell, cells[1:])
-            return
 
-        idxs: set[int] = set().union(*iconstellation(order, len(solution)))
-        idxs -= idxs_of_known_values
-        potential_conflicts = {solution[i] for i in idxs}
-
-        for candidate in sorted(cells[0] - potential_conflicts):
-            yield from _add_cell(solution + candidate, cells[1:])
+        This is a depth-first search with an explicit stack of candidate iterators,
+        one per cell. The progressive solution lives in a single bytearray indexed
+        by the stack depth, so backtracking just abandons a cursor position instead
+        of allocating a fresh string per step.
+        """
+        buf = bytearray(len(partial_solution))
+
+        def _candidates_at(cursor: int) -> Iterator[int]:
+            vals = cell_candidates[cursor]
+            if len(vals) == 1:
+                return iter(vals)
+            potential_conflicts = {buf[i] for i in unknown_neighbors[cursor]}
+            return iter([v for v in vals if v not in potential_conflicts])
+
+        stack = [_candidates_at(0)]
+        while stack:
+            cursor = len(stack) - 1
+            try:
+                buf[cursor] = next(stack[-1])
+            except StopIteration:
+                _ = stack.pop()
+                continue
+            if cursor + 1 == len(partial_solution):
+                yield buf.decode()
+            else:
+                stack.append(_candidates_at(cursor + 1))
 
     yield from _add_cell()
 
@@ -11,8 +11,7 @@ in Haskell (in my narrow conception of Haskell, at least).
 
 import functools as ft
 import itertools as it
-import operator as op
-from typing import Callable, Container, Iterable, Iterator, TypeVar
+from typing import Callable, Iterable, Iterator, TypeVar
 
 # ===============================================================================
 #   Create functions that return the indices of the cells in the same row, column, or
@@ -69,11 +68,6 @@ _T = TypeVar("_T")
 _U = TypeVar("_U")
 
 
-def op_contains_flipped(item: _T, container: Container[_T]) -> bool:
-    """Reverse the arguments to operator.contains."""
-    return op.contains(container, item)
-
-
 def _app(arg: _T, funcs: Iterable[Callable[[_T], _U]]) -> tuple[_U, ...]:
     """Apply a function to a sequence of arguments.
 
@@ -90,20 +84,9 @@ def _try_items(board: str, idxs: tuple[int, ...]) -> str:
 
     :param board: The board to get items from.
     :param idxs: A monotonically increasing iterable of indices.
-    :yield: The items in board at the given indices if they exist.
+    :return: The items in board at the given indices if they exist.
     """
-
-    def try_items(idxs_: tuple[int, ...], result: str = "") -> str:
-        try:
-            head, tail = idxs_[0], idxs_[1:]
-        except IndexError:
-            return result
-        try:
-            return try_items(tail, result + board[head])
-        except IndexError:
-            return result
-
-    return try_items(idxs)
+    return "".join(board[i] for i in idxs if i < len(board))
 
 
 # ===============================================================================
@@ -133,6 +116,20 @@ def new_solver(puzzle: str) -> Callable[[str], Iterator[str]]:
     idx_group_getters = _app(side_len, (_new_col_idxer, _new_row_idxer, _new_box_idxer))
     iter_candidates = ft.partial(_iter_candidates, side_len)
 
+    @ft.lru_cache
+    def get_idx_groups(cell_idx: int) -> tuple[tuple[int, ...], ...]:
+        """Return the col, row, and box indices of a cell."""
+        return _app(cell_idx, idx_group_getters)
+
+    def add_candidate_if_no_conflicts(board: str, candidate: str) -> str | None:
+        """Add one candidate to the board if it doesn't conflict."""
+        for idx_group in get_idx_groups(len(board)):
+            if candidate in _try_items(puzzle, idx_group):
+                return None
+            if candidate in _try_items(board, idx_group):
+                return None
+        return board + candidate
+
     def solve_from_here(board: str = "") -> Iterator[str]:
         """Yield solutions to the puzzle, starting from board."""
         if len(board) == len(puzzle):
@@ -141,19 +138,6 @@ def new_solver(puzzle: str) -> Callable[[str], Iterator[str]]:
         if puzzle[len(board)] != "0":
             yield from solve_from_here(board + puzzle[len(board)])
             return
-        idx_groups = [f(len(board)) for f in idx_group_getters]
-
-        def add_candidate_if_no_conflicts(board: str, candidate: str) -> str | None:
-            """Add one candidate to the board if it doesn't conflict."""
-            candidate_in_group_values = ft.partial(op_contains_flipped, candidate)
-            try_puzzle = ft.partial(_try_items, puzzle)
-            if any(map(candidate_in_group_values, map(try_puzzle, idx_groups))):
-                return
-            try_board = ft.partial(_try_items, board)
-            if any(map(candidate_in_group_values, map(try_board, idx_groups))):
-                return
-            return board + candidate
-
         yield from it.chain(
             *map(
                 solve_from_here,